@@ -1,10 +1,20 @@
 import streamlit as st
 import pandas as pd
 import os
-import pickle
 import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
+from functools import partial
+from model_registry import ModelRegistry
+from export_utils import EXPORT_FORMATS, available_formats, export_results
+from persistent_cache import PersistentCache
+import prediction_service as service
+from prediction_service import (
+    DATA_PATH,
+    build_result_row,
+    create_feature_comparison,
+    create_gauge_chart,
+    get_category_and_message,
+)
 
 # === Page Configuration ===
 st.set_page_config(
@@ -23,62 +33,50 @@ st.markdown("""
 
 # === Load Model dan Dataset ===
 @st.cache_resource
-def load_model():
-    model_path = "xgb_optuna_model.pkl"
-    if not os.path.exists(model_path):
-        st.error("❌ Model belum ditemukan. Pastikan file 'xgb_optuna_model.pkl' tersedia.")
+def load_cache():
+    """Cache SQLite bersama antar restart dan replika di host yang sama"""
+    return PersistentCache()
+
+@st.cache_resource
+def load_registry():
+    try:
+        return ModelRegistry.from_manifest()
+    except (ValueError, KeyError) as e:
+        st.error(f"❌ model_registry.json tidak valid: {e}")
+        st.stop()
+
+def check_production_model():
+    if registry.production_model is None:
+        st.error(f"❌ Model produksi '{registry.production}' belum ditemukan. Pastikan file model yang terdaftar di 'model_registry.json' tersedia.")
         st.stop()
-    with open(model_path, "rb") as f:
-        return pickle.load(f)
 
 @st.cache_data
 def load_data():
-    data_path = "data_mahasiswa_cleaned.csv"
-    if not os.path.exists(data_path):
+    if not os.path.exists(DATA_PATH):
         st.error("❌ Dataset belum ditemukan. Pastikan file 'data_mahasiswa_cleaned.csv' tersedia.")
         st.stop()
-    df = pd.read_csv(data_path)
-    return df
+    return service.load_dataset(cache)
+
+@st.cache_resource
+def load_nim_index():
+    """NIM -> posisi baris di df (NIM duplikat memakai baris pertama)"""
+    return service.load_nim_index(cache, df, COLS)
+
+@st.cache_resource
+def load_predictions():
+    """Prediksi IPK seluruh dataset untuk setiap model terdaftar (satu kolom per model)"""
+    # Kandidat yang gagal dikeluarkan oleh registry; hanya kegagalan model produksi yang fatal
+    try:
+        return service.load_predictions(cache, registry, df, COLS)
+    except Exception as e:
+        st.error(f"❌ Model produksi '{registry.production}' gagal memprediksi: {e}")
+        st.stop()
 
 # === COLUMN NAME MAPPING ===
 def get_column_names(df):
     """Auto-detect column names with fallback options"""
-    
-    # Possible column name variations
-    nim_cols = ['NIM', 'nim', 'student_id', 'StudentID', 'ID']
-    nama_cols = ['nama', 'Nama', 'name', 'Name', 'student_name']
-    ipk_cols = ['IPK', 'ipk', 'GPA', 'gpa', 'cumulative_gpa']
-    nilai_cols = ['rata2_nilai', 'avg_grade', 'average_grade', 'rata_nilai']
-    hadir_cols = ['rata2_hadir', 'avg_attendance', 'average_attendance', 'rata_hadir']
-    mk_cols = ['jumlah_mk_diambil', 'courses_taken', 'course_taken', 'total_courses']
-    
-    columns = {
-        'NIM': None,
-        'nama': None,
-        'IPK': None,
-        'rata2_nilai': None,
-        'rata2_hadir': None,
-        'jumlah_mk_diambil': None
-    }
-    
-    # Find matching columns
-    for col in df.columns:
-        if col in nim_cols:
-            columns['NIM'] = col
-        elif col in nama_cols:
-            columns['nama'] = col
-        elif col in ipk_cols:
-            columns['IPK'] = col
-        elif col in nilai_cols:
-            columns['rata2_nilai'] = col
-        elif col in hadir_cols:
-            columns['rata2_hadir'] = col
-        elif col in mk_cols:
-            columns['jumlah_mk_diambil'] = col
-    
-    # Check required columns
-    required = ['NIM', 'rata2_nilai', 'rata2_hadir', 'jumlah_mk_diambil']
-    missing = [k for k in required if columns[k] is None]
+    columns = service.detect_column_names(df)
+    missing = service.missing_required_columns(columns)
     
     if missing:
         st.error(f"❌ Kolom yang diperlukan tidak ditemukan: {', '.join(missing)}")
@@ -87,108 +85,13 @@ def get_column_names(df):
     
     return columns
 
-model = load_model()
+cache = load_cache()
+registry = load_registry()
+check_production_model()
 df = load_data()
 COLS = get_column_names(df)  # Get actual column names
-
-# === Helper Functions ===
-def get_category_and_message(pred_ipk):
-    """Menentukan kategori dan pesan berdasarkan prediksi IPK"""
-    if pred_ipk >= 3.51:
-        return {
-            "kategori": "🏆 CUM LAUDE",
-            "color": "success",
-            "emoji": "🎉",
-            "pesan": "Mahasiswa menunjukkan kinerja akademik luar biasa dengan pola nilai dan kehadiran yang sangat konsisten.",
-            "rekomendasi": "Pertahankan performa dan jadilah role model bagi mahasiswa lain."
-        }
-    elif pred_ipk >= 3.01:
-        return {
-            "kategori": "✅ SANGAT MEMUASKAN",
-            "color": "success",
-            "emoji": "👏",
-            "pesan": "Kinerja akademik sangat baik dengan partisipasi belajar yang konsisten.",
-            "rekomendasi": "Pertahankan performa dan tingkatkan keterlibatan di kegiatan akademik."
-        }
-    elif pred_ipk >= 2.76:
-        return {
-            "kategori": "⚠️ MEMUASKAN",
-            "color": "warning",
-            "emoji": "💪",
-            "pesan": "Kinerja akademik cukup baik namun masih dapat ditingkatkan.",
-            "rekomendasi": "Tingkatkan kehadiran dan partisipasi kelas untuk hasil yang lebih optimal."
-        }
-    else:
-        return {
-            "kategori": "❌ PERLU PERHATIAN",
-            "color": "error",
-            "emoji": "🚨",
-            "pesan": "Kinerja akademik memerlukan perhatian khusus dan intervensi segera.",
-            "rekomendasi": "Segera konsultasi dengan dosen pembimbing akademik dan manfaatkan program mentoring."
-        }
-
-def create_gauge_chart(value, title):
-    """Membuat gauge chart untuk visualisasi metrik"""
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number+delta",
-        value = value,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': title, 'font': {'size': 20}},
-        delta = {'reference': 3.0, 'increasing': {'color': "green"}},
-        gauge = {
-            'axis': {'range': [None, 4.0], 'tickwidth': 1, 'tickcolor': "darkblue"},
-            'bar': {'color': "darkblue"},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 2.76], 'color': '#ffcccb'},
-                {'range': [2.76, 3.0], 'color': '#ffffcc'},
-                {'range': [3.0, 3.51], 'color': '#ccffcc'},
-                {'range': [3.51, 4.0], 'color': '#90EE90'}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': 3.5
-            }
-        }
-    ))
-    
-    fig.update_layout(
-        height=300,
-        margin=dict(l=20, r=20, t=50, b=20),
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'color': "darkblue", 'family': "Arial"}
-    )
-    
-    return fig
-
-def create_feature_comparison(mahasiswa):
-    """Membuat bar chart perbandingan fitur mahasiswa vs rata-rata"""
-    avg_nilai = df[COLS['rata2_nilai']].mean()
-    avg_hadir = df[COLS['rata2_hadir']].mean()
-    avg_mk = df[COLS['jumlah_mk_diambil']].mean()
-    
-    fig = go.Figure(data=[
-        go.Bar(name='Mahasiswa Ini', x=['Rata-rata Nilai', 'Rata-rata Kehadiran', 'Jumlah MK'],
-               y=[mahasiswa[COLS['rata2_nilai']], mahasiswa[COLS['rata2_hadir']], mahasiswa[COLS['jumlah_mk_diambil']]],
-               marker_color='#667eea'),
-        go.Bar(name='Rata-rata Kampus', x=['Rata-rata Nilai', 'Rata-rata Kehadiran', 'Jumlah MK'],
-               y=[avg_nilai, avg_hadir, avg_mk],
-               marker_color='#764ba2')
-    ])
-    
-    fig.update_layout(
-        title='Perbandingan dengan Rata-rata Kampus',
-        barmode='group',
-        height=400,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': "darkblue"}
-    )
-    
-    return fig
+nim_index = load_nim_index()
+predictions = load_predictions()
 
 # === Sidebar ===
 with st.sidebar:
@@ -196,19 +99,24 @@ with st.sidebar:
     
     st.markdown("---")
     st.markdown("### 📊 Model Information")
-    st.info("""
-    **Model:** XGBoost (Optuna-Optimized)
+    metrics_text = "\n".join(
+        f"    - {name}: {value:.4f}" for name, value in registry.production_entry.get("metrics", {}).items()
+    )
+    st.info(f"""
+    **Model:** XGBoost (Optuna-Optimized) `{registry.production}`
     
     **Performance:**
-    - R² Score: 0.8637
-    - RMSE: 0.1165
-    - MAE: 0.0809
+{metrics_text}
     
     **Features Used:**
     - Rata-rata Nilai
     - Rata-rata Kehadiran
     - Jumlah MK Diambil
     """)
+    if len(registry.models) > 1:
+        st.caption(f"🧪 {len(registry.models) - 1} model kandidat terdaftar")
+    for key, error in registry.errors.items():
+        st.warning(f"⚠️ Model '{key}' dinonaktifkan: {error}")
     
     st.markdown("---")
     st.markdown("### 📈 Dataset Statistics")
@@ -232,7 +140,7 @@ st.markdown('<p class="big-header">🎓 Sistem Prediksi Keberhasilan Akademik</p
 st.markdown('<p class="sub-header">Powered by Machine Learning - XGBoost Optuna Optimization</p>', unsafe_allow_html=True)
 
 # === Tabs for Different Sections ===
-tab1, tab2, tab3 = st.tabs(["🔍 Prediksi Individual", "📊 Prediksi Massal", "📈 Dashboard Analytics"])
+tab1, tab2, tab3, tab4 = st.tabs(["🔍 Prediksi Individual", "📊 Prediksi Massal", "📈 Dashboard Analytics", "🧪 Perbandingan Model"])
 
 # === TAB 1: Individual Prediction ===
 with tab1:
@@ -248,8 +156,12 @@ with tab1:
         predict_button = st.button("🚀 Prediksi IPK", use_container_width=True)
     
     if input_nim and predict_button:
-        try:
-            mahasiswa = df[df[COLS['NIM']].astype(str) == input_nim].iloc[0]
+        posisi = nim_index.get(input_nim)
+        if posisi is None:
+            st.error("❌ NIM tidak ditemukan dalam database.")
+            st.info("💡 Pastikan NIM yang dimasukkan sudah terdaftar di sistem.")
+        else:
+            mahasiswa = df.iloc[posisi]
             
             # Student Info Section
             st.markdown("---")
@@ -291,13 +203,7 @@ with tab1:
                     """, unsafe_allow_html=True)
             
             # Prediction Section
-            fitur = pd.DataFrame([{
-                "rata2_nilai": mahasiswa[COLS['rata2_nilai']],
-                "rata2_hadir": mahasiswa[COLS['rata2_hadir']],
-                "jumlah_mk_diambil": mahasiswa[COLS['jumlah_mk_diambil']]
-            }])
-            
-            prediksi_ipk = model.predict(fitur)[0]
+            prediksi_ipk = predictions[registry.production].iat[posisi]
             result = get_category_and_message(prediksi_ipk)
             
             st.markdown("---")
@@ -336,12 +242,8 @@ with tab1:
             
             # Comparison chart
             st.markdown("---")
-            fig_comparison = create_feature_comparison(mahasiswa)
+            fig_comparison = create_feature_comparison(mahasiswa, df, COLS)
             st.plotly_chart(fig_comparison, use_container_width=True)
-            
-        except IndexError:
-            st.error("❌ NIM tidak ditemukan dalam database.")
-            st.info("💡 Pastikan NIM yang dimasukkan sudah terdaftar di sistem.")
 
 # === TAB 2: Batch Prediction ===
 with tab2:
@@ -373,17 +275,19 @@ with tab2:
     if uploaded_file:
         try:
             # Read file
-            filename = uploaded_file.name.lower()
-            if filename.endswith(".csv"):
-                uploaded_df = pd.read_csv(uploaded_file)
-            elif filename.endswith((".xlsx", ".xls")):
-                uploaded_df = pd.read_excel(uploaded_file, engine="openpyxl")
+            uploaded_df = service.read_uploaded_table(uploaded_file)
             
             if "NIM" not in uploaded_df.columns:
                 st.error("❌ Kolom 'NIM' tidak ditemukan dalam file.")
             else:
                 st.success(f"✅ File berhasil diupload! Ditemukan {len(uploaded_df)} NIM.")
                 
+                export_format = st.selectbox(
+                    "💾 Format file hasil",
+                    available_formats(),
+                    help="CSV (gzip), Parquet, dan XLSX menghasilkan file yang jauh lebih kecil untuk hasil besar"
+                )
+                
                 if st.button("🚀 Mulai Prediksi Massal", use_container_width=True):
                     progress_bar = st.progress(0)
                     status_text = st.empty()
@@ -395,37 +299,9 @@ with tab2:
                         status_text.text(f"Processing {idx+1}/{total}: NIM {nim}")
                         progress_bar.progress((idx + 1) / total)
                         
-                        try:
-                            mhs = df[df[COLS['NIM']].astype(str) == nim].iloc[0]
-                            fitur = pd.DataFrame([{
-                                "rata2_nilai": mhs[COLS['rata2_nilai']],
-                                "rata2_hadir": mhs[COLS['rata2_hadir']],
-                                "jumlah_mk_diambil": mhs[COLS['jumlah_mk_diambil']]
-                            }])
-                            pred_ipk = model.predict(fitur)[0]
-                            result = get_category_and_message(pred_ipk)
-                            
-                            result_rows.append({
-                                "NIM": nim,
-                                "Nama": mhs.get(COLS['nama'], "-") if COLS['nama'] else "-",
-                                "Rata2 Nilai": round(mhs[COLS['rata2_nilai']], 2),
-                                "Rata2 Kehadiran": round(mhs[COLS['rata2_hadir']], 2),
-                                "Jumlah MK": int(mhs[COLS['jumlah_mk_diambil']]),
-                                "Prediksi IPK": round(pred_ipk, 2),
-                                "Kategori": result['kategori'],
-                                "Rekomendasi": result['rekomendasi']
-                            })
-                        except:
-                            result_rows.append({
-                                "NIM": nim,
-                                "Nama": "-",
-                                "Rata2 Nilai": "-",
-                                "Rata2 Kehadiran": "-",
-                                "Jumlah MK": "-",
-                                "Prediksi IPK": "-",
-                                "Kategori": "❌ Tidak ditemukan",
-                                "Rekomendasi": "Data tidak tersedia"
-                            })
+                        posisi = nim_index.get(nim)
+                        pred_ipk = predictions[registry.production].iat[posisi] if posisi is not None else None
+                        result_rows.append(build_result_row(nim, posisi, df, COLS, pred_ipk))
                     
                     status_text.empty()
                     progress_bar.empty()
@@ -438,34 +314,22 @@ with tab2:
                     
                     col1, col2, col3, col4 = st.columns(4)
                     
-                    valid_predictions = hasil_df[hasil_df['Prediksi IPK'] != '-']
+                    ringkasan = service.summarize_results(hasil_df)
+                    valid_predictions = ringkasan['valid']
                     
                     with col1:
-                        st.metric("Total Mahasiswa", len(hasil_df))
+                        st.metric("Total Mahasiswa", ringkasan['total'])
                     with col2:
                         st.metric("Prediksi Berhasil", len(valid_predictions))
                     with col3:
-                        if len(valid_predictions) > 0:
-                            avg_pred = valid_predictions['Prediksi IPK'].mean()
-                            st.metric("Rata-rata Prediksi IPK", f"{avg_pred:.2f}")
+                        if ringkasan['rata2'] is not None:
+                            st.metric("Rata-rata Prediksi IPK", f"{ringkasan['rata2']:.2f}")
                     with col4:
-                        cum_laude = len(valid_predictions[valid_predictions['Prediksi IPK'] >= 3.51])
-                        st.metric("Cum Laude", cum_laude)
+                        st.metric("Cum Laude", ringkasan['cum_laude'])
                     
                     # Distribution chart
                     if len(valid_predictions) > 0:
-                        fig_dist = px.histogram(
-                            valid_predictions,
-                            x='Prediksi IPK',
-                            nbins=20,
-                            title='Distribusi Prediksi IPK',
-                            color_discrete_sequence=['#667eea']
-                        )
-                        fig_dist.update_layout(
-                            xaxis_title='Prediksi IPK',
-                            yaxis_title='Jumlah Mahasiswa',
-                            height=400
-                        )
+                        fig_dist = service.create_prediction_histogram(valid_predictions)
                         st.plotly_chart(fig_dist, use_container_width=True)
                     
                     # Results table
@@ -474,12 +338,13 @@ with tab2:
                     st.dataframe(hasil_df, use_container_width=True, height=400)
                     
                     # Download button
-                    csv = hasil_df.to_csv(index=False).encode("utf-8")
+                    # File ekspor baru dibuat saat tombol diklik (data callable), tanpa rerun halaman
                     st.download_button(
-                        "⬇️ Download Hasil (CSV)",
-                        data=csv,
-                        file_name=f"hasil_prediksi_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv",
+                        f"⬇️ Download Hasil ({export_format})",
+                        data=partial(export_results, hasil_df, export_format),
+                        file_name=f"hasil_prediksi_{datetime.now().strftime('%Y%m%d_%H%M%S')}{EXPORT_FORMATS[export_format]['ext']}",
+                        mime=EXPORT_FORMATS[export_format]['mime'],
+                        on_click="ignore",
                         use_container_width=True
                     )
                     
@@ -490,65 +355,37 @@ with tab2:
 with tab3:
     st.markdown("### 📈 Dashboard Analitik Dataset")
     
+    dashboard = service.build_dashboard(df, COLS)
+    figures = dashboard['figures']
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Mahasiswa", f"{len(df):,}")
+        st.metric("Total Mahasiswa", f"{dashboard['total']:,}")
     with col2:
-        if COLS['IPK'] and COLS['IPK'] in df.columns:
-            st.metric("Rata-rata IPK", f"{df[COLS['IPK']].mean():.2f}")
+        if dashboard['mean_ipk'] is not None:
+            st.metric("Rata-rata IPK", f"{dashboard['mean_ipk']:.2f}")
         else:
             st.metric("Rata-rata IPK", "N/A")
     with col3:
-        if COLS['IPK'] and COLS['IPK'] in df.columns:
-            st.metric("Std Dev IPK", f"{df[COLS['IPK']].std():.2f}")
+        if dashboard['std_ipk'] is not None:
+            st.metric("Std Dev IPK", f"{dashboard['std_ipk']:.2f}")
         else:
             st.metric("Std Dev IPK", "N/A")
     
     st.markdown("---")
     
     # Only show analytics if IPK column exists
-    if COLS['IPK'] and COLS['IPK'] in df.columns:
+    if figures:
         # GPA Distribution
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_gpa_dist = px.histogram(
-                df,
-                x=COLS['IPK'],
-                nbins=30,
-                title='Distribusi IPK Mahasiswa',
-                color_discrete_sequence=['#667eea']
-            )
-            fig_gpa_dist.add_vline(x=df[COLS['IPK']].mean(), line_dash="dash", line_color="red",
-                                  annotation_text="Mean")
-            fig_gpa_dist.update_layout(height=400)
-            st.plotly_chart(fig_gpa_dist, use_container_width=True)
+            st.plotly_chart(figures['gpa_dist'], use_container_width=True)
         
         with col2:
             # GPA Categories
-            categories = []
-            for ipk in df[COLS['IPK']]:
-                if ipk >= 3.51:
-                    categories.append('Cum Laude')
-                elif ipk >= 3.01:
-                    categories.append('Sangat Memuaskan')
-                elif ipk >= 2.76:
-                    categories.append('Memuaskan')
-                else:
-                    categories.append('Perlu Perhatian')
-            
-            df_cat = pd.DataFrame({'Kategori': categories})
-            cat_counts = df_cat['Kategori'].value_counts()
-            
-            fig_pie = px.pie(
-                values=cat_counts.values,
-                names=cat_counts.index,
-                title='Distribusi Kategori Kelulusan',
-                color_discrete_sequence=['#11998e', '#38ef7d', '#f093fb', '#f5576c']
-            )
-            fig_pie.update_layout(height=400)
-            st.plotly_chart(fig_pie, use_container_width=True)
+            st.plotly_chart(figures['pie'], use_container_width=True)
         
         st.markdown("---")
         
@@ -556,32 +393,84 @@ with tab3:
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_scatter1 = px.scatter(
-                df,
-                x=COLS['rata2_nilai'],
-                y=COLS['IPK'],
-                title='Hubungan Rata-rata Nilai vs IPK',
-                trendline="ols",
-                color_discrete_sequence=['#667eea']
-            )
-            fig_scatter1.update_layout(height=400)
-            st.plotly_chart(fig_scatter1, use_container_width=True)
+            st.plotly_chart(figures['scatter_nilai'], use_container_width=True)
         
         with col2:
-            fig_scatter2 = px.scatter(
-                df,
-                x=COLS['rata2_hadir'],
-                y=COLS['IPK'],
-                title='Hubungan Rata-rata Kehadiran vs IPK',
-                trendline="ols",
-                color_discrete_sequence=['#764ba2']
-            )
-            fig_scatter2.update_layout(height=400)
-            st.plotly_chart(fig_scatter2, use_container_width=True)
+            st.plotly_chart(figures['scatter_hadir'], use_container_width=True)
     else:
         st.warning("⚠️ Kolom IPK tidak ditemukan di dataset. Dashboard analytics tidak tersedia.")
         st.info("💡 Dashboard hanya menampilkan statistik dasar tanpa analisis IPK aktual.")
 
+# === TAB 4: Model Comparison ===
+with tab4:
+    st.markdown("### 🧪 Perbandingan Model Produksi vs Kandidat")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**📊 Metrik Model Terdaftar**")
+        st.dataframe(registry.metrics_table(), use_container_width=True, hide_index=True)
+    with col2:
+        st.markdown("**💾 Memori per Model**")
+        st.dataframe(registry.memory_report(), use_container_width=True, hide_index=True)
+    
+    if len(registry.models) < 2:
+        st.info("💡 Daftarkan model kandidat di 'model_registry.json' untuk membandingkannya dengan model produksi.")
+    else:
+        st.markdown("---")
+        sumber = st.radio("Sumber data:", ["Seluruh Dataset", "Upload File NIM"], horizontal=True)
+        
+        target_df = None
+        if sumber == "Seluruh Dataset":
+            target_df = df
+        else:
+            compare_file = st.file_uploader(
+                "📎 Pilih file berisi kolom NIM",
+                type=["csv", "xlsx", "xls"],
+                key="compare_upload"
+            )
+            if compare_file:
+                try:
+                    compare_df = service.read_uploaded_table(compare_file)
+                    
+                    if "NIM" not in compare_df.columns:
+                        st.error("❌ Kolom 'NIM' tidak ditemukan dalam file.")
+                    else:
+                        nims = compare_df["NIM"].astype(str)
+                        target_df = df[df[COLS['NIM']].astype(str).isin(nims)]
+                        tidak_ditemukan = (~nims.isin(df[COLS['NIM']].astype(str))).sum()
+                        if tidak_ditemukan:
+                            st.warning(f"⚠️ {tidak_ditemukan} NIM tidak ditemukan dalam database.")
+                except Exception as e:
+                    st.error(f"❌ Terjadi kesalahan: {e}")
+        
+        if target_df is not None and len(target_df) > 0:
+            if st.button("🚀 Bandingkan Model", use_container_width=True):
+                prediksi = predictions.loc[target_df.index]
+                deltas, summary = registry.compare(prediksi)
+                
+                st.markdown("### 📊 Ringkasan Kesepakatan")
+                st.dataframe(summary.round(4), use_container_width=True, hide_index=True)
+                
+                fig_delta = px.histogram(
+                    deltas.melt(var_name='Model', value_name='Δ Prediksi IPK'),
+                    x='Δ Prediksi IPK',
+                    color='Model',
+                    nbins=40,
+                    barmode='overlay',
+                    title=f'Distribusi Selisih Prediksi terhadap {registry.production}'
+                )
+                fig_delta.update_layout(height=400)
+                st.plotly_chart(fig_delta, use_container_width=True)
+                
+                st.markdown("### 📋 Delta per Mahasiswa")
+                detail = pd.concat([
+                    target_df[[COLS['NIM']]].astype(str).rename(columns={COLS['NIM']: 'NIM'}),
+                    prediksi.round(4),
+                    deltas.round(4)
+                ], axis=1)
+                detail = detail.loc[deltas.abs().max(axis=1).sort_values(ascending=False).index]
+                st.dataframe(detail, use_container_width=True, height=400, hide_index=True)
+
 # === Footer ===
 st.markdown("---")
 st.markdown("""
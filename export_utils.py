@@ -0,0 +1,112 @@
+"""Ekspor hasil prediksi massal ke CSV, CSV gzip, Parquet, dan XLSX.
+
+Hasil ditulis bertahap per potongan baris ke buffer di memori. app.py
+memanggil export_results lewat download_button yang ditunda (callable), jadi
+file hanya dibuat saat advisor mengklik download. Hanya Parquet yang
+menyimpan Kategori dan Rekomendasi sebagai kode kategorikal (dictionary
+encoding); CSV gzip dan XLSX tetap menulis teks lengkap per baris, dan
+pengulangannya hanya diperkecil oleh kompresi gzip/zip.
+"""
+import gzip
+import io
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet tidak ditawarkan tanpa pyarrow
+    pa = pq = None
+
+try:
+    import openpyxl
+except ImportError:  # XLSX tidak ditawarkan tanpa openpyxl
+    openpyxl = None
+
+CHUNK_ROWS = 5000
+
+CATEGORICAL_COLUMNS = ["Kategori", "Rekomendasi"]
+NUMERIC_COLUMNS = ["Rata2 Nilai", "Rata2 Kehadiran", "Jumlah MK", "Prediksi IPK"]
+
+# CSV polos di urutan pertama agar tetap menjadi format download default
+EXPORT_FORMATS = {
+    "CSV": {"ext": ".csv", "mime": "text/csv"},
+    "CSV (gzip)": {"ext": ".csv.gz", "mime": "application/gzip"},
+    "Parquet": {"ext": ".parquet", "mime": "application/vnd.apache.parquet"},
+    "XLSX": {"ext": ".xlsx", "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+}
+
+
+def available_formats():
+    """Format yang dependensinya terpasang, urut sesuai EXPORT_FORMATS."""
+    formats = []
+    for name in EXPORT_FORMATS:
+        if name == "Parquet" and pq is None:
+            continue
+        if name == "XLSX" and openpyxl is None:
+            continue
+        formats.append(name)
+    return formats
+
+
+def to_categorical(hasil_df):
+    """Kolom teks berulang diubah ke dtype category (tanpa menyalin kolom lain)."""
+    return hasil_df.assign(**{
+        col: hasil_df[col].astype("category")
+        for col in CATEGORICAL_COLUMNS if col in hasil_df.columns
+    })
+
+
+def _chunks(df, chunk_rows):
+    # Minimal satu potongan agar header tetap ditulis untuk hasil kosong
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield start, df.iloc[start:start + chunk_rows]
+
+
+def _write_csv(df, buffer, chunk_rows, compress):
+    out = gzip.GzipFile(fileobj=buffer, mode="wb") if compress else buffer
+    for start, chunk in _chunks(df, chunk_rows):
+        out.write(chunk.to_csv(index=False, header=(start == 0)).encode("utf-8"))
+    if compress:
+        out.close()  # menulis trailer gzip, buffer tetap terbuka
+
+
+def _write_parquet(df, buffer, chunk_rows):
+    # Kolom angka berisi "-" untuk NIM yang tidak ditemukan -> NaN
+    df = df.assign(**{
+        col: pd.to_numeric(df[col], errors="coerce")
+        for col in NUMERIC_COLUMNS if col in df.columns
+    })
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(buffer, schema, compression="zstd") as writer:
+        for _, chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def _write_xlsx(df, buffer, chunk_rows):
+    # Mode write-only menulis string inline, teks kategori tetap diulang per baris
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Hasil Prediksi")
+    ws.append(list(df.columns))
+    for _, chunk in _chunks(df, chunk_rows):
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(list(row))
+    wb.save(buffer)
+
+
+def export_results(hasil_df, fmt, chunk_rows=CHUNK_ROWS):
+    """Isi file hasil dalam format `fmt` sebagai bytes."""
+    if fmt not in available_formats():
+        raise ValueError(f"Format ekspor tidak didukung: {fmt}")
+
+    df = to_categorical(hasil_df)
+    with io.BytesIO() as buffer:
+        if fmt == "CSV (gzip)":
+            _write_csv(df, buffer, chunk_rows, compress=True)
+        elif fmt == "CSV":
+            _write_csv(df, buffer, chunk_rows, compress=False)
+        elif fmt == "Parquet":
+            _write_parquet(df, buffer, chunk_rows)
+        else:
+            _write_xlsx(df, buffer, chunk_rows)
+        return buffer.getvalue()
@@ -0,0 +1,597 @@
+"""Load testing lokal untuk app.py.
+
+Mensimulasikan banyak advisor yang memakai aplikasi secara bersamaan di satu
+mesin. Setiap sesi menjalankan campuran operasi (lookup NIM, upload massal,
+dashboard) dengan NIM sintetis yang diambil dari data_mahasiswa_cleaned.csv,
+lalu melaporkan latensi p50/p95/p99, throughput, dan memori selama pengujian.
+
+Target:
+    app       : app.py dijalankan dengan `streamlit run --server.headless true`
+                sebagai subprocess (atau server yang sudah jalan lewat --url).
+                Setiap sesi membuka koneksi websocket sendiri seperti tab
+                browser: rerun dengan nilai widget, upload file lewat
+                /_stcore/upload_file, lalu menunggu script_finished. Memori
+                yang dicatat adalah RSS proses server.
+    headless  : logika prediction_service.py yang sama dengan app.py (baris
+                hasil, kategori, figure plotly) tanpa server, rerun skrip
+                penuh, dan serialisasi UI. Memori yang dicatat adalah RSS
+                proses ini.
+
+Contoh:
+    python loadtest.py --target app --sessions 8 --duration 30
+    python loadtest.py --target app --url http://localhost:8501 --server-pid 12345
+    python loadtest.py --target headless --sessions 20 --mix nim=6,batch=1,dashboard=3
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import UploadedFileInfo
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+import prediction_service as service
+from model_registry import ModelRegistry
+from persistent_cache import PersistentCache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, service.DATA_PATH)
+APP_PATH = os.path.join(BASE_DIR, "app.py")
+
+SCENARIOS = ("nim", "batch", "dashboard")
+
+# Label widget di app.py yang dipakai sesi simulasi
+NIM_INPUT_LABEL = "🔢 Masukkan NIM Mahasiswa:"
+NIM_BUTTON_LABEL = "🚀 Prediksi IPK"
+UPLOAD_LABEL = "📎 Pilih file untuk diupload"
+BATCH_BUTTON_LABEL = "🚀 Mulai Prediksi Massal"
+# st.error yang memang diharapkan untuk NIM sintetis yang tidak terdaftar
+# (emoji di awal pesan dipindah Streamlit ke field icon)
+EXPECTED_ERRORS = ("NIM tidak ditemukan dalam database.",)
+
+
+# === Memory Sampling ===
+class MemorySampler(threading.Thread):
+    """Mencatat RSS sebuah proses (server Streamlit atau proses ini) secara periodik."""
+
+    def __init__(self, interval, pid="self"):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.pid = pid
+        self.samples = []
+        self._stop_event = threading.Event()
+        self._start = time.perf_counter()
+
+    def _sample(self):
+        rss = service.rss_bytes(self.pid) if self.pid is not None else None
+        if rss is not None:
+            self.samples.append((time.perf_counter() - self._start, rss))
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self._sample()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self._sample()
+
+
+# === Synthetic Workload ===
+class NimSource:
+    """NIM sintetis dari dataset, dengan sebagian NIM yang tidak terdaftar."""
+
+    def __init__(self, nims, miss_rate, seed):
+        self.nims = [str(n) for n in nims]
+        self.miss_rate = miss_rate
+        self._max_nim = max(int(n) for n in self.nims if n.isdigit()) if self.nims else 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def one(self):
+        with self._lock:
+            if self._rng.random() < self.miss_rate:
+                # NIM di luar rentang dataset -> jalur "tidak ditemukan"
+                return str(self._max_nim + self._rng.randint(1, 10**6))
+            return self._rng.choice(self.nims)
+
+    def many(self, n):
+        return [self.one() for _ in range(n)]
+
+
+def parse_mix(text):
+    """Parse 'nim=6,batch=1,dashboard=3' menjadi bobot per skenario."""
+    weights = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Skenario tidak dikenal: {name}")
+        weights[name] = float(weight or 1)
+    if sum(weights.values()) <= 0:
+        raise argparse.ArgumentTypeError("Total bobot mix harus lebih dari 0")
+    return weights
+
+
+def parse_sizes(text):
+    sizes = [int(s) for s in text.split(",") if s.strip()]
+    if not sizes or min(sizes) <= 0:
+        raise argparse.ArgumentTypeError("Ukuran batch harus bilangan positif")
+    return sizes
+
+
+# === Streamlit Server ===
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class StreamlitServer:
+    """`streamlit run app.py --server.headless true` sebagai subprocess."""
+
+    def __init__(self, port, timeout):
+        self.port = port or free_port()
+        self.timeout = timeout
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process = None
+        self._log = None
+
+    def __enter__(self):
+        self._log = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "streamlit", "run", APP_PATH,
+                "--server.headless", "true",
+                "--server.port", str(self.port),
+                # Sesi simulasi tidak punya cookie XSRF browser untuk upload file
+                "--server.enableXsrfProtection", "false",
+                "--browser.gatherUsageStats", "false",
+            ],
+            cwd=BASE_DIR,
+            stdout=self._log,
+            stderr=subprocess.STDOUT,
+        )
+        try:
+            self._wait_healthy()
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def _wait_healthy(self):
+        deadline = time.perf_counter() + self.timeout
+        while time.perf_counter() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server Streamlit berhenti saat start:\n{self.log_tail()}")
+            try:
+                if requests.get(f"{self.url}/_stcore/health", timeout=1).ok:
+                    return
+            except requests.ConnectionError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"Server Streamlit tidak siap dalam {self.timeout:.0f} detik:\n{self.log_tail()}")
+
+    def log_tail(self, n_bytes=4000):
+        self._log.seek(0, os.SEEK_END)
+        self._log.seek(max(0, self._log.tell() - n_bytes))
+        return self._log.read().decode("utf-8", "replace")
+
+    def __exit__(self, *exc):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self._log.close()
+
+
+def _text_state(widget_id, value):
+    return WidgetState(id=widget_id, string_value=value)
+
+
+def _trigger_state(widget_id):
+    return WidgetState(id=widget_id, trigger_value=True)
+
+
+def _files_state(widget_id, files):
+    state = WidgetState(id=widget_id)
+    state.file_uploader_state_value.uploaded_file_info.extend(files)
+    return state
+
+
+class ServerSession:
+    """Satu tab browser: koneksi websocket sendiri ke /_stcore/stream."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session_id = None
+        self.widget_ids = {}
+        self._stack = contextlib.ExitStack()
+        self._ws = None
+
+    def __enter__(self):
+        ws_url = "ws" + self.base_url[len("http"):] + "/_stcore/stream"
+        try:
+            self._ws = self._stack.enter_context(connect(
+                ws_url, subprotocols=["streamlit"], max_size=None, open_timeout=self.timeout
+            ))
+            # Browser menjalankan skrip sekali saat halaman dibuka
+            self.rerun()
+            if self.session_id is None:
+                raise RuntimeError("Server tidak mengirim session_id")
+        except BaseException:
+            self._stack.close()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self._stack.close()
+
+    def _send(self, back_msg):
+        self._ws.send(back_msg.SerializeToString())
+
+    def _recv(self):
+        msg = ForwardMsg()
+        msg.ParseFromString(self._ws.recv(timeout=self.timeout))
+        return msg
+
+    def widget(self, label):
+        try:
+            return self.widget_ids[label]
+        except KeyError:
+            raise RuntimeError(f"Widget '{label}' tidak dirender app.py") from None
+
+    def rerun(self, widgets=()):
+        """Rerun app.py dengan nilai widget dan menunggu script_finished.
+
+        Mengembalikan himpunan tipe elemen yang dirender; exception dan
+        st.error yang tidak diharapkan dilaporkan setelah rerun selesai.
+        """
+        back_msg = BackMsg()
+        back_msg.rerun_script.widget_states.widgets.extend(widgets)
+        self._send(back_msg)
+
+        elements = set()
+        errors = []
+        while True:
+            msg = self._recv()
+            kind = msg.WhichOneof("type")
+            if kind == "new_session" and msg.new_session.initialize.session_id:
+                self.session_id = msg.new_session.initialize.session_id
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                elements.add(element_type)
+                widget = getattr(element, element_type)
+                if element_type == "exception":
+                    errors.append(f"{widget.type}: {widget.message}")
+                elif element_type == "alert" and widget.format == Alert.ERROR:
+                    if widget.body not in EXPECTED_ERRORS:
+                        errors.append(widget.body)
+                elif getattr(widget, "id", "") and getattr(widget, "label", ""):
+                    self.widget_ids[widget.label] = widget.id
+            elif kind == "script_finished":
+                status = msg.script_finished
+                if status != ForwardMsg.FINISHED_SUCCESSFULLY:
+                    errors.append(f"Rerun selesai dengan status {ForwardMsg.ScriptFinishedStatus.Name(status)}")
+                break
+
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return elements
+
+    def upload(self, file_name, data, mime):
+        """Upload seperti browser: minta URL lewat websocket lalu PUT multipart."""
+        back_msg = BackMsg()
+        back_msg.file_urls_request.request_id = uuid.uuid4().hex
+        back_msg.file_urls_request.file_names.append(file_name)
+        back_msg.file_urls_request.session_id = self.session_id
+        self._send(back_msg)
+
+        while True:
+            msg = self._recv()
+            if (msg.WhichOneof("type") == "file_urls_response"
+                    and msg.file_urls_response.response_id == back_msg.file_urls_request.request_id):
+                break
+        urls = msg.file_urls_response.file_urls[0]
+
+        response = requests.put(
+            self.base_url + urls.upload_url,
+            files={"file": (file_name, data, mime)},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return UploadedFileInfo(file_id=urls.file_id, name=file_name, size=len(data), file_urls=urls)
+
+    def delete_upload(self, file_info):
+        requests.delete(self.base_url + file_info.file_urls.delete_url, timeout=self.timeout).raise_for_status()
+
+
+# === Targets ===
+class AppTarget:
+    """app.py lewat server Streamlit sungguhan; satu koneksi websocket per sesi."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.notes = []
+
+    def new_session(self):
+        return ServerSession(self.base_url, self.timeout)
+
+    def nim(self, session, nim):
+        session.rerun([
+            _text_state(session.widget(NIM_INPUT_LABEL), nim),
+            _trigger_state(session.widget(NIM_BUTTON_LABEL)),
+        ])
+
+    def batch(self, session, nims):
+        data = pd.DataFrame({"NIM": nims}).to_csv(index=False).encode("utf-8")
+        file_info = session.upload("nim_advisor.csv", data, "text/csv")
+        files = _files_state(session.widget(UPLOAD_LABEL), [file_info])
+        try:
+            # Browser melakukan rerun setelah upload, lalu setelah tombol diklik
+            session.rerun([files])
+            elements = session.rerun([files, _trigger_state(session.widget(BATCH_BUTTON_LABEL))])
+        finally:
+            session.delete_upload(file_info)
+        if "download_button" not in elements:
+            raise RuntimeError("Hasil prediksi massal tidak dirender (download_button tidak ada)")
+
+    def dashboard(self, session):
+        # Semua tab dirender pada setiap rerun, termasuk dashboard
+        session.rerun()
+
+
+class HeadlessTarget:
+    """Logika tab1/tab2/tab3 app.py lewat prediction_service, tanpa server Streamlit."""
+
+    notes = [
+        "Target headless menjalankan logika per operasi dari prediction_service.py "
+        "(baris hasil, kategori, figure plotly) tanpa rerun skrip penuh, websocket, "
+        "dan serialisasi UI; angkanya bukan latensi end-to-end.",
+    ]
+
+    def __init__(self):
+        # Semua model terdaftar dimuat seperti di app.py; prediksi memakai model produksi
+        registry = ModelRegistry.from_manifest()
+        if registry.production_model is None:
+            raise RuntimeError(f"Model produksi '{registry.production}' gagal dimuat: {registry.errors}")
+        cache = PersistentCache()
+        self.df = service.load_dataset(cache)
+        self.cols = service.detect_column_names(self.df)
+        missing = service.missing_required_columns(self.cols)
+        if missing:
+            raise RuntimeError(f"Kolom yang diperlukan tidak ditemukan: {', '.join(missing)}")
+        self.nim_index = service.load_nim_index(cache, self.df, self.cols)
+        self.predictions = service.load_predictions(cache, registry, self.df, self.cols)[registry.production]
+
+    def new_session(self):
+        return contextlib.nullcontext()
+
+    def _prediction(self, nim):
+        posisi = self.nim_index.get(nim)
+        return posisi, (self.predictions.iat[posisi] if posisi is not None else None)
+
+    def nim(self, session, nim):
+        posisi, pred_ipk = self._prediction(nim)
+        if posisi is None:
+            return
+        service.get_category_and_message(pred_ipk)
+        service.create_gauge_chart(pred_ipk, "Prediksi IPK")
+        service.create_feature_comparison(self.df.iloc[posisi], self.df, self.cols)
+
+    def batch(self, session, nims):
+        rows = []
+        for nim in nims:
+            posisi, pred_ipk = self._prediction(nim)
+            rows.append(service.build_result_row(nim, posisi, self.df, self.cols, pred_ipk))
+        ringkasan = service.summarize_results(pd.DataFrame(rows))
+        if len(ringkasan["valid"]) > 0:
+            service.create_prediction_histogram(ringkasan["valid"])
+
+    def dashboard(self, session):
+        service.build_dashboard(self.df, self.cols)
+
+
+# === Runner ===
+def run_session(target, args, nim_source, deadline, records, lock, seed):
+    rng = random.Random(seed)
+    names = list(args.mix)
+    weights = [args.mix[n] for n in names]
+    with contextlib.ExitStack() as stack:
+        try:
+            session = stack.enter_context(target.new_session())
+        except Exception as e:
+            with lock:
+                records.append(("session_start", 0.0, False, repr(e)))
+            return
+
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            error = None
+            try:
+                if scenario == "nim":
+                    target.nim(session, nim_source.one())
+                elif scenario == "batch":
+                    size = rng.choice(args.batch_sizes)
+                    scenario = f"batch[{size}]"
+                    target.batch(session, nim_source.many(size))
+                else:
+                    target.dashboard(session)
+            except Exception as e:
+                error = repr(e)
+            elapsed = time.perf_counter() - start
+            with lock:
+                records.append((scenario, elapsed, error is None, error))
+            if args.think_time:
+                time.sleep(rng.uniform(0, args.think_time))
+
+
+def percentile(sorted_values, q):
+    """Percentile nearest-rank dari list yang sudah terurut."""
+    if not sorted_values:
+        return float("nan")
+    k = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[k - 1]
+
+
+def summarize(records, elapsed, samples, notes=()):
+    groups = {}
+    for scenario, latency, ok, _ in records:
+        groups.setdefault(scenario, []).append((latency, ok))
+    groups["ALL"] = [(lat, ok) for _, lat, ok, _ in records]
+
+    scenarios = {}
+    for name, rows in groups.items():
+        latencies = sorted(lat for lat, _ in rows)
+        scenarios[name] = {
+            "count": len(rows),
+            "errors": sum(1 for _, ok in rows if not ok),
+            "throughput_rps": len(rows) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": (latencies[-1] * 1000) if latencies else float("nan"),
+        }
+
+    errors = {}
+    for _, _, ok, error in records:
+        if not ok:
+            errors[error] = errors.get(error, 0) + 1
+
+    return {
+        "elapsed_s": elapsed,
+        "notes": list(notes),
+        "scenarios": scenarios,
+        "memory": [{"t_s": round(t, 2), "rss_mb": round(b / 2**20, 1)} for t, b in samples],
+        "peak_rss_mb": round(max(b for _, b in samples) / 2**20, 1) if samples else None,
+        "errors": errors,
+    }
+
+
+def print_report(report, args):
+    print(f"\n=== Load Test: target={args.target} sessions={args.sessions} "
+          f"durasi={report['elapsed_s']:.1f}s ===")
+    for note in report["notes"]:
+        print(f"Catatan: {note}")
+    header = f"{'skenario':<16}{'count':>8}{'err':>6}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    order = sorted(k for k in report["scenarios"] if k != "ALL") + ["ALL"]
+    for name in order:
+        s = report["scenarios"][name]
+        print(f"{name:<16}{s['count']:>8}{s['errors']:>6}{s['throughput_rps']:>9.2f}"
+              f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+
+    print("\nMemori (RSS) selama pengujian:")
+    for sample in report["memory"]:
+        print(f"  t={sample['t_s']:>7.1f}s  {sample['rss_mb']:>8.1f} MB")
+    print(f"Peak RSS: {report['peak_rss_mb']} MB")
+
+    if report["errors"]:
+        print("\nError:")
+        for error, count in sorted(report["errors"].items(), key=lambda kv: -kv[1]):
+            print(f"  {count:>6}x {error}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Load test lokal untuk aplikasi prediksi IPK")
+    parser.add_argument("--target", choices=["app", "headless"], default="app")
+    parser.add_argument("--sessions", type=int, default=10, help="Jumlah sesi advisor bersamaan")
+    parser.add_argument("--duration", type=float, default=30.0, help="Durasi pengujian (detik)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("nim=6,batch=1,dashboard=3"),
+                        help="Bobot skenario, mis. nim=6,batch=1,dashboard=3")
+    parser.add_argument("--batch-sizes", type=parse_sizes, default=parse_sizes("10,100,500"),
+                        help="Ukuran upload massal yang diacak, mis. 10,100,500")
+    parser.add_argument("--miss-rate", type=float, default=0.05,
+                        help="Proporsi NIM yang tidak terdaftar di dataset")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Jeda acak maksimum antar operasi per sesi (detik)")
+    parser.add_argument("--sample-interval", type=float, default=1.0,
+                        help="Interval sampling memori (detik)")
+    parser.add_argument("--url", help="Pakai server Streamlit yang sudah jalan, mis. http://localhost:8501")
+    parser.add_argument("--server-pid", type=int,
+                        help="PID server untuk sampling memori bila memakai --url")
+    parser.add_argument("--port", type=int, default=0,
+                        help="Port server Streamlit yang dijalankan (default: port bebas)")
+    parser.add_argument("--app-timeout", type=float, default=60.0,
+                        help="Timeout start server dan satu rerun app.py (detik)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Simpan laporan lengkap ke file JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # app.py dan registry membuka model dan dataset dengan path relatif
+    os.chdir(BASE_DIR)
+
+    nims = pd.read_csv(DATA_PATH, usecols=["NIM"])["NIM"].tolist()
+    nim_source = NimSource(nims, args.miss_rate, args.seed)
+
+    with contextlib.ExitStack() as stack:
+        if args.target == "app":
+            if args.url:
+                base_url, pid = args.url, args.server_pid
+            else:
+                server = stack.enter_context(StreamlitServer(args.port, args.app_timeout))
+                base_url, pid = server.url, server.process.pid
+            sampler = MemorySampler(args.sample_interval, pid)
+            sampler.start()
+            target = AppTarget(base_url, args.app_timeout)
+            # Warm-up: model, dataset, dan prediksi dimuat server sebelum pengukuran
+            with target.new_session():
+                pass
+            target.notes.append(
+                f"RSS dicatat dari proses server Streamlit (pid {pid})." if pid is not None
+                else "RSS server tidak dicatat; berikan --server-pid bersama --url."
+            )
+        else:
+            sampler = MemorySampler(args.sample_interval)
+            sampler.start()
+            target = HeadlessTarget()
+
+        records = []
+        lock = threading.Lock()
+        start = time.perf_counter()
+        deadline = start + args.duration
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            for i in range(args.sessions):
+                pool.submit(run_session, target, args, nim_source, deadline, records, lock, args.seed + i)
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+
+    report = summarize(records, elapsed, sampler.samples, target.notes)
+    print_report(report, args)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nLaporan disimpan ke {args.json_path}")
+    return 0 if not report["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
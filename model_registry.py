@@ -0,0 +1,204 @@
+"""Registry model berversi untuk prediksi IPK.
+
+Daftar model dibaca dari model_registry.json. Setiap entri memuat nama, versi,
+path file pickle, metrik evaluasi, dan penanda model produksi, misalnya:
+
+    {
+      "models": [
+        {"name": "xgb_optuna", "version": "1.0", "path": "xgb_optuna_model.pkl",
+         "production": true, "metrics": {"R²": 0.8637, "RMSE": 0.1165, "MAE": 0.0809}},
+        {"name": "xgb_optuna", "version": "1.1", "path": "models/xgb_optuna_v1_1.pkl",
+         "metrics": {"R²": 0.87, "RMSE": 0.11, "MAE": 0.078}}
+      ]
+    }
+
+Semua model dimuat sekali, lalu dataset atau file upload diskor terhadap semua
+model dalam satu pass di atas matriks fitur yang sama.
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+REGISTRY_PATH = "model_registry.json"
+FEATURES = ["rata2_nilai", "rata2_hadir", "jumlah_mk_diambil"]
+
+# Dipakai bila model_registry.json belum ada
+DEFAULT_ENTRY = {
+    "name": "xgb_optuna",
+    "version": "1.0",
+    "path": "xgb_optuna_model.pkl",
+    "production": True,
+    "metrics": {"R²": 0.8637, "RMSE": 0.1165, "MAE": 0.0809},
+}
+
+# Batas bawah kategori (>=), dipakai get_category_and_message di prediction_service.py
+CATEGORY_BINS = [-np.inf, 2.76, 3.01, 3.51, np.inf]
+CATEGORY_LABELS = ["Perlu Perhatian", "Memuaskan", "Sangat Memuaskan", "Cum Laude"]
+
+
+def _booster_bytes(model):
+    """Ukuran booster XGBoost (model sendiri atau langkah terakhir Pipeline)."""
+    estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+    if not hasattr(estimator, "get_booster"):
+        return None
+    return len(estimator.get_booster().save_raw())
+
+
+def load_manifest(path=REGISTRY_PATH):
+    """Membaca daftar entri model; fallback ke model produksi bawaan."""
+    if not os.path.exists(path):
+        return [dict(DEFAULT_ENTRY)]
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)["models"]
+    if not entries:
+        raise ValueError(f"Tidak ada model yang terdaftar di {path}")
+    if sum(1 for e in entries if e.get("production")) > 1:
+        raise ValueError(f"Lebih dari satu model produksi di {path}")
+    return entries
+
+
+def model_key(entry):
+    return f"{entry['name']}@{entry['version']}"
+
+
+def categorize(predictions):
+    """Kategori kelulusan untuk seluruh prediksi sekaligus."""
+    return pd.cut(predictions, CATEGORY_BINS, labels=CATEGORY_LABELS, right=False)
+
+
+def build_feature_matrix(df, cols):
+    """Matriks fitur bersama dengan nama kolom yang dipakai saat training."""
+    return pd.DataFrame({feature: df[cols[feature]].to_numpy() for feature in FEATURES}, index=df.index)
+
+
+def feature_signature(cols):
+    """Sidik matriks fitur (pemetaan kolom + kode build_feature_matrix) untuk key cache prediksi."""
+    mapping = json.dumps([[feature, cols[feature]] for feature in FEATURES])
+    source = inspect.getsource(build_feature_matrix)
+    return hashlib.sha256((mapping + source).encode("utf-8")).hexdigest()[:16]
+
+
+class ModelRegistry:
+    """Memuat semua model terdaftar sekali dan menyimpan metriknya."""
+
+    def __init__(self, entries):
+        self.entries = {}
+        self.models = {}
+        self.memory = {}
+        self.errors = {}
+        for entry in entries:
+            key = model_key(entry)
+            # Satu model yang rusak (file hilang, modul pickle tidak terpasang,
+            # versi library tidak cocok) tidak boleh menjatuhkan model lain
+            try:
+                self.models[key] = self._load(entry, key)
+                self.entries[key] = entry
+            except Exception as e:
+                self.errors[key] = f"{type(e).__name__}: {e}"
+
+        production = [model_key(e) for e in entries if e.get("production")]
+        self.production = production[0] if production else next(iter(self.entries), None)
+
+    @classmethod
+    def from_manifest(cls, path=REGISTRY_PATH):
+        return cls(load_manifest(path))
+
+    def _load(self, entry, key):
+        with open(entry["path"], "rb") as f:
+            model = pickle.load(f)
+        self.memory[key] = {
+            "file_bytes": os.path.getsize(entry["path"]),
+            "booster_bytes": _booster_bytes(model),
+        }
+        return model
+
+    def _drop(self, key, error):
+        self.models.pop(key, None)
+        self.entries.pop(key, None)
+        self.memory.pop(key, None)
+        self.errors[key] = error
+
+    @property
+    def production_model(self):
+        return self.models.get(self.production)
+
+    @property
+    def production_entry(self):
+        return self.entries.get(self.production)
+
+    def memory_report(self):
+        """Ukuran file pickle dan booster XGBoost tiap model yang dimuat.
+
+        Ukuran booster adalah angka per model yang stabil; kenaikan RSS proses
+        didominasi import library dan runtime native yang dipakai bersama.
+        """
+        rows = []
+        for key, mem in self.memory.items():
+            booster = mem["booster_bytes"]
+            rows.append({
+                "Model": key,
+                "Produksi": key == self.production,
+                "Ukuran File (KB)": round(mem["file_bytes"] / 1024, 1),
+                "Ukuran Booster (KB)": round(booster / 1024, 1) if booster is not None else None,
+            })
+        return pd.DataFrame(rows)
+
+    def metrics_table(self):
+        rows = [{"Model": key, **entry.get("metrics", {})} for key, entry in self.entries.items()]
+        return pd.DataFrame(rows)
+
+    def score_all(self, features, keys=None):
+        """Prediksi semua model (atau `keys`) di atas satu matriks fitur, satu kolom per model.
+
+        Kandidat yang gagal memprediksi dicatat di `errors` dan dikeluarkan dari
+        registry; kegagalan model produksi tetap dilempar.
+        """
+        keys = list(self.models) if keys is None else keys
+        scored = {}
+        for key in keys:
+            try:
+                pred = np.asarray(self.models[key].predict(features), dtype=float).reshape(-1)
+                if len(pred) != len(features):
+                    raise ValueError(f"{len(pred)} prediksi untuk {len(features)} baris")
+                scored[key] = pred
+            except Exception as e:
+                if key == self.production:
+                    raise
+                self._drop(key, f"Gagal memprediksi: {type(e).__name__}: {e}")
+        return pd.DataFrame(scored, index=features.index)
+
+    def compare(self, predictions, baseline=None):
+        """Delta per mahasiswa dan ringkasan kesepakatan terhadap model baseline.
+
+        Mengembalikan (deltas, summary): deltas berisi selisih prediksi tiap
+        kandidat terhadap baseline, summary berisi satu baris per kandidat.
+        """
+        baseline = baseline or self.production
+        base = predictions[baseline]
+        base_cat = categorize(base)
+
+        deltas = pd.DataFrame(index=predictions.index)
+        summary = []
+        for key in predictions.columns:
+            if key == baseline:
+                continue
+            diff = predictions[key] - base
+            deltas[f"Δ {key}"] = diff
+            abs_diff = diff.abs()
+            same_cat = categorize(predictions[key]) == base_cat
+            summary.append({
+                "Model": key,
+                "Baseline": baseline,
+                "Mean Δ": diff.mean(),
+                "MAE vs Baseline": abs_diff.mean(),
+                "Max |Δ|": abs_diff.max(),
+                "Korelasi": predictions[key].corr(base),
+                "Kesepakatan Kategori (%)": same_cat.mean() * 100,
+                "Beda Kategori": int((~same_cat).sum()),
+            })
+        return deltas, pd.DataFrame(summary)
@@ -0,0 +1,206 @@
+"""Cache persisten di disk (SQLite) yang bertahan antar restart dan replika.
+
+st.cache_data dan st.cache_resource hanya hidup di dalam satu proses. Modul ini
+menyimpan snapshot dataset, indeks NIM, dan hasil prediksi di satu file SQLite
+sehingga proses baru (redeploy, crash, replika lain di host yang sama) bisa
+langsung memakai hasil yang sudah ada.
+
+Key dibentuk lewat cache_key: versi format cache, versi library (pandas,
+numpy, pyarrow, xgboost, scikit-learn, Python), dan hash isi file data dan
+model. Entri lama otomatis tidak terpakai lagi ketika salah satunya berubah.
+Total ukuran dibatasi; entri yang paling lama tidak diakses dihapus lebih dulu.
+
+Nilai disimpan sebagai bytes tanpa pickle, sehingga file cache yang bisa
+ditulis proses lain tidak bisa menjalankan kode: DataFrame sebagai Parquet,
+prediksi sebagai array float64 mentah, dan indeks NIM sebagai JSON. Entri yang
+gagal didekode dihapus dan dihitung ulang.
+
+Konfigurasi lewat environment variable:
+    PREDIKSI_CACHE_PATH    lokasi file SQLite (default .cache/prediksi_cache.sqlite3)
+    PREDIKSI_CACHE_MAX_MB  batas ukuran total entri (default 256)
+"""
+import hashlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from importlib import metadata
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATH = os.environ.get("PREDIKSI_CACHE_PATH", os.path.join(".cache", "prediksi_cache.sqlite3"))
+DEFAULT_MAX_BYTES = int(float(os.environ.get("PREDIKSI_CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+# Naikkan bila format nilai atau susunan key berubah
+CACHE_VERSION = 2
+VERSIONED_LIBRARIES = ["pandas", "numpy", "pyarrow", "xgboost", "scikit-learn"]
+
+_hash_memo = {}
+_hash_lock = threading.Lock()
+
+
+def library_versions():
+    versions = {"python": platform.python_version()}
+    for name in VERSIONED_LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+_LIBRARY_TAG = hashlib.sha256(json.dumps(library_versions(), sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def cache_key(kind, *parts):
+    """Key entri: jenis, versi cache, sidik versi library, lalu bagian lain (hash file, dll)."""
+    return ":".join([kind, f"v{CACHE_VERSION}", _LIBRARY_TAG, *(str(part) for part in parts)])
+
+
+def file_hash(path):
+    """SHA-256 isi file, di-memo per (path, mtime, size) agar tidak dibaca ulang."""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _hash_lock:
+        if memo_key in _hash_memo:
+            return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    value = digest.hexdigest()
+
+    with _hash_lock:
+        _hash_memo[memo_key] = value
+    return value
+
+
+# === Codecs ===
+Codec = namedtuple("Codec", ["encode", "decode"])
+
+
+def _encode_frame(df):
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=True)
+    return buffer.getvalue()
+
+
+def _decode_frame(blob):
+    return pd.read_parquet(io.BytesIO(blob))
+
+
+def _encode_array(values):
+    return np.ascontiguousarray(values, dtype="<f8").tobytes()
+
+
+def _decode_array(blob):
+    if len(blob) % 8:
+        raise ValueError("Panjang blob bukan kelipatan float64")
+    return np.frombuffer(blob, dtype="<f8").copy()
+
+
+def _encode_json(value):
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_json(blob):
+    return json.loads(blob.decode("utf-8"))
+
+
+FRAME = Codec(_encode_frame, _decode_frame)
+ARRAY = Codec(_encode_array, _decode_array)
+JSON = Codec(_encode_json, _decode_json)
+
+
+class PersistentCache:
+    """Key-value store berbasis SQLite dengan eviksi LRU berdasarkan ukuran."""
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        # WAL: pembaca dari replika lain tidak terblokir oleh penulis
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)")
+
+    def get(self, key, codec, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return default
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        try:
+            return codec.decode(bytes(row[0]))
+        except Exception:
+            # Entri rusak (file terpotong, ditulis proses lain) -> hapus dan hitung ulang
+            self.delete(key)
+            return default
+
+    def set(self, key, value, codec):
+        try:
+            blob = codec.encode(value)
+        except ImportError:
+            return  # Parquet butuh pyarrow; tanpa pyarrow nilai tidak di-cache
+        if len(blob) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, sqlite3.Binary(blob), len(blob), now, now),
+                )
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def get_or_compute(self, key, compute, codec):
+        """Ambil dari cache, atau hitung dengan `compute()` lalu simpan."""
+        sentinel = object()
+        value = self.get(key, codec, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.set(key, value, codec)
+        return value
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self):
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes}
@@ -0,0 +1,333 @@
+"""Logika prediksi IPK tanpa Streamlit, dipakai bersama oleh app.py dan loadtest.py.
+
+Berisi deteksi kolom, pemuatan dataset/indeks NIM/prediksi lewat cache persisten,
+kategori hasil, baris hasil prediksi massal, serta pembuatan figure plotly untuk
+tab prediksi dan dashboard. app.py hanya merender hasilnya.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from model_registry import CATEGORY_BINS, build_feature_matrix, categorize, feature_signature
+from persistent_cache import ARRAY, FRAME, JSON, cache_key, file_hash
+
+DATA_PATH = "data_mahasiswa_cleaned.csv"
+
+# Variasi nama kolom yang dikenali
+COLUMN_ALIASES = {
+    'NIM': ['NIM', 'nim', 'student_id', 'StudentID', 'ID'],
+    'nama': ['nama', 'Nama', 'name', 'Name', 'student_name'],
+    'IPK': ['IPK', 'ipk', 'GPA', 'gpa', 'cumulative_gpa'],
+    'rata2_nilai': ['rata2_nilai', 'avg_grade', 'average_grade', 'rata_nilai'],
+    'rata2_hadir': ['rata2_hadir', 'avg_attendance', 'average_attendance', 'rata_hadir'],
+    'jumlah_mk_diambil': ['jumlah_mk_diambil', 'courses_taken', 'course_taken', 'total_courses'],
+}
+REQUIRED_COLUMNS = ['NIM', 'rata2_nilai', 'rata2_hadir', 'jumlah_mk_diambil']
+
+# Batas bawah kategori (>=), sama dengan CATEGORY_BINS
+_, MEMUASKAN_MIN, SANGAT_MEMUASKAN_MIN, CUM_LAUDE_MIN, _ = CATEGORY_BINS
+
+
+# === Memory ===
+def rss_bytes(pid="self"):
+    """Resident set size sebuah proses (default proses ini), None bila tidak tersedia."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# === Column Mapping ===
+def detect_column_names(df):
+    """Memetakan nama kolom standar ke kolom di df (None bila tidak ada)."""
+    columns = {name: None for name in COLUMN_ALIASES}
+    for col in df.columns:
+        for name, aliases in COLUMN_ALIASES.items():
+            if col in aliases:
+                columns[name] = col
+                break
+    return columns
+
+
+def missing_required_columns(columns):
+    return [k for k in REQUIRED_COLUMNS if columns[k] is None]
+
+
+def read_uploaded_table(uploaded_file):
+    """Membaca file upload (.csv, .xlsx, .xls) berisi daftar NIM."""
+    filename = uploaded_file.name.lower()
+    if filename.endswith(".csv"):
+        return pd.read_csv(uploaded_file)
+    if filename.endswith((".xlsx", ".xls")):
+        return pd.read_excel(uploaded_file, engine="openpyxl")
+    raise ValueError(f"Format file tidak didukung: {uploaded_file.name}")
+
+
+# === Dataset, Indeks NIM, Prediksi ===
+def load_dataset(cache, path=DATA_PATH):
+    return cache.get_or_compute(cache_key("dataset", file_hash(path)), lambda: pd.read_csv(path), FRAME)
+
+
+def build_nim_index(df, nim_col):
+    """NIM -> posisi baris di df (NIM duplikat memakai baris pertama)."""
+    nims = df[nim_col].astype(str)
+    positions = pd.Series(np.arange(len(df)), index=nims)
+    return positions[~nims.duplicated().to_numpy()].to_dict()
+
+
+def load_nim_index(cache, df, cols, path=DATA_PATH):
+    return cache.get_or_compute(
+        cache_key("nim_index", file_hash(path), cols['NIM']),
+        lambda: build_nim_index(df, cols['NIM']),
+        JSON
+    )
+
+
+def predictions_cache_key(data_path, model_path, cols):
+    # Sidik fitur: perubahan pemetaan kolom atau build_feature_matrix tidak memakai prediksi lama
+    return cache_key("predictions", file_hash(data_path), file_hash(model_path), feature_signature(cols))
+
+
+def load_predictions(cache, registry, df, cols, path=DATA_PATH):
+    """Prediksi IPK seluruh dataset untuk setiap model terdaftar (satu kolom per model)."""
+    cache_keys = {
+        key: predictions_cache_key(path, registry.entries[key]['path'], cols)
+        for key in registry.models
+    }
+    cached = {key: cache.get(entry_key, ARRAY) for key, entry_key in cache_keys.items()}
+    # Array dengan panjang berbeda dari dataset diperlakukan sebagai miss
+    cached = {key: pred if pred is not None and len(pred) == len(df) else None for key, pred in cached.items()}
+
+    # Model yang belum ada di cache diskor bersama dalam satu pass
+    missing = [key for key, pred in cached.items() if pred is None]
+    if missing:
+        scored = registry.score_all(build_feature_matrix(df, cols), missing)
+        for key in scored.columns:
+            cached[key] = scored[key].to_numpy()
+            cache.set(cache_keys[key], cached[key], ARRAY)
+
+    return pd.DataFrame({key: cached[key] for key in registry.models}, index=df.index)
+
+
+# === Kategori dan Hasil ===
+def get_category_and_message(pred_ipk):
+    """Menentukan kategori dan pesan berdasarkan prediksi IPK"""
+    if pred_ipk >= CUM_LAUDE_MIN:
+        return {
+            "kategori": "🏆 CUM LAUDE",
+            "color": "success",
+            "emoji": "🎉",
+            "pesan": "Mahasiswa menunjukkan kinerja akademik luar biasa dengan pola nilai dan kehadiran yang sangat konsisten.",
+            "rekomendasi": "Pertahankan performa dan jadilah role model bagi mahasiswa lain."
+        }
+    elif pred_ipk >= SANGAT_MEMUASKAN_MIN:
+        return {
+            "kategori": "✅ SANGAT MEMUASKAN",
+            "color": "success",
+            "emoji": "👏",
+            "pesan": "Kinerja akademik sangat baik dengan partisipasi belajar yang konsisten.",
+            "rekomendasi": "Pertahankan performa dan tingkatkan keterlibatan di kegiatan akademik."
+        }
+    elif pred_ipk >= MEMUASKAN_MIN:
+        return {
+            "kategori": "⚠️ MEMUASKAN",
+            "color": "warning",
+            "emoji": "💪",
+            "pesan": "Kinerja akademik cukup baik namun masih dapat ditingkatkan.",
+            "rekomendasi": "Tingkatkan kehadiran dan partisipasi kelas untuk hasil yang lebih optimal."
+        }
+    else:
+        return {
+            "kategori": "❌ PERLU PERHATIAN",
+            "color": "error",
+            "emoji": "🚨",
+            "pesan": "Kinerja akademik memerlukan perhatian khusus dan intervensi segera.",
+            "rekomendasi": "Segera konsultasi dengan dosen pembimbing akademik dan manfaatkan program mentoring."
+        }
+
+
+def build_result_row(nim, posisi, df, cols, pred_ipk):
+    """Satu baris hasil prediksi massal; posisi None berarti NIM tidak ditemukan."""
+    if posisi is None:
+        return {
+            "NIM": nim,
+            "Nama": "-",
+            "Rata2 Nilai": "-",
+            "Rata2 Kehadiran": "-",
+            "Jumlah MK": "-",
+            "Prediksi IPK": "-",
+            "Kategori": "❌ Tidak ditemukan",
+            "Rekomendasi": "Data tidak tersedia"
+        }
+    mhs = df.iloc[posisi]
+    result = get_category_and_message(pred_ipk)
+    return {
+        "NIM": nim,
+        "Nama": mhs.get(cols['nama'], "-") if cols['nama'] else "-",
+        "Rata2 Nilai": round(mhs[cols['rata2_nilai']], 2),
+        "Rata2 Kehadiran": round(mhs[cols['rata2_hadir']], 2),
+        "Jumlah MK": int(mhs[cols['jumlah_mk_diambil']]),
+        "Prediksi IPK": round(pred_ipk, 2),
+        "Kategori": result['kategori'],
+        "Rekomendasi": result['rekomendasi']
+    }
+
+
+def summarize_results(hasil_df):
+    """Ringkasan hasil prediksi massal untuk metrik di tab2."""
+    valid = hasil_df[hasil_df['Prediksi IPK'] != '-']
+    return {
+        "total": len(hasil_df),
+        "valid": valid,
+        "rata2": valid['Prediksi IPK'].mean() if len(valid) > 0 else None,
+        "cum_laude": int((valid['Prediksi IPK'] >= CUM_LAUDE_MIN).sum()) if len(valid) > 0 else 0,
+    }
+
+
+# === Figures ===
+def create_gauge_chart(value, title):
+    """Membuat gauge chart untuk visualisasi metrik"""
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = value,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': title, 'font': {'size': 20}},
+        delta = {'reference': 3.0, 'increasing': {'color': "green"}},
+        gauge = {
+            'axis': {'range': [None, 4.0], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': "darkblue"},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, 2.76], 'color': '#ffcccb'},
+                {'range': [2.76, 3.0], 'color': '#ffffcc'},
+                {'range': [3.0, 3.51], 'color': '#ccffcc'},
+                {'range': [3.51, 4.0], 'color': '#90EE90'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 3.5
+            }
+        }
+    ))
+
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=50, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        font={'color': "darkblue", 'family': "Arial"}
+    )
+
+    return fig
+
+
+def create_feature_comparison(mahasiswa, df, cols):
+    """Membuat bar chart perbandingan fitur mahasiswa vs rata-rata"""
+    avg_nilai = df[cols['rata2_nilai']].mean()
+    avg_hadir = df[cols['rata2_hadir']].mean()
+    avg_mk = df[cols['jumlah_mk_diambil']].mean()
+
+    fig = go.Figure(data=[
+        go.Bar(name='Mahasiswa Ini', x=['Rata-rata Nilai', 'Rata-rata Kehadiran', 'Jumlah MK'],
+               y=[mahasiswa[cols['rata2_nilai']], mahasiswa[cols['rata2_hadir']], mahasiswa[cols['jumlah_mk_diambil']]],
+               marker_color='#667eea'),
+        go.Bar(name='Rata-rata Kampus', x=['Rata-rata Nilai', 'Rata-rata Kehadiran', 'Jumlah MK'],
+               y=[avg_nilai, avg_hadir, avg_mk],
+               marker_color='#764ba2')
+    ])
+
+    fig.update_layout(
+        title='Perbandingan dengan Rata-rata Kampus',
+        barmode='group',
+        height=400,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': "darkblue"}
+    )
+
+    return fig
+
+
+def create_prediction_histogram(valid_predictions):
+    """Distribusi prediksi IPK hasil prediksi massal"""
+    fig = px.histogram(
+        valid_predictions,
+        x='Prediksi IPK',
+        nbins=20,
+        title='Distribusi Prediksi IPK',
+        color_discrete_sequence=['#667eea']
+    )
+    fig.update_layout(
+        xaxis_title='Prediksi IPK',
+        yaxis_title='Jumlah Mahasiswa',
+        height=400
+    )
+    return fig
+
+
+def build_dashboard(df, cols):
+    """Statistik dan figure tab Dashboard; figures None bila kolom IPK tidak ada."""
+    has_ipk = bool(cols['IPK'] and cols['IPK'] in df.columns)
+    dashboard = {
+        "total": len(df),
+        "mean_ipk": df[cols['IPK']].mean() if has_ipk else None,
+        "std_ipk": df[cols['IPK']].std() if has_ipk else None,
+        "figures": None,
+    }
+    if not has_ipk:
+        return dashboard
+
+    fig_gpa_dist = px.histogram(
+        df,
+        x=cols['IPK'],
+        nbins=30,
+        title='Distribusi IPK Mahasiswa',
+        color_discrete_sequence=['#667eea']
+    )
+    fig_gpa_dist.add_vline(x=dashboard["mean_ipk"], line_dash="dash", line_color="red",
+                           annotation_text="Mean")
+    fig_gpa_dist.update_layout(height=400)
+
+    cat_counts = categorize(df[cols['IPK']]).value_counts()
+    cat_counts = cat_counts[cat_counts > 0]
+    fig_pie = px.pie(
+        values=cat_counts.values,
+        names=cat_counts.index.astype(str),
+        title='Distribusi Kategori Kelulusan',
+        color_discrete_sequence=['#11998e', '#38ef7d', '#f093fb', '#f5576c']
+    )
+    fig_pie.update_layout(height=400)
+
+    fig_scatter1 = px.scatter(
+        df,
+        x=cols['rata2_nilai'],
+        y=cols['IPK'],
+        title='Hubungan Rata-rata Nilai vs IPK',
+        trendline="ols",
+        color_discrete_sequence=['#667eea']
+    )
+    fig_scatter1.update_layout(height=400)
+
+    fig_scatter2 = px.scatter(
+        df,
+        x=cols['rata2_hadir'],
+        y=cols['IPK'],
+        title='Hubungan Rata-rata Kehadiran vs IPK',
+        trendline="ols",
+        color_discrete_sequence=['#764ba2']
+    )
+    fig_scatter2.update_layout(height=400)
+
+    dashboard["figures"] = {
+        "gpa_dist": fig_gpa_dist,
+        "pie": fig_pie,
+        "scatter_nilai": fig_scatter1,
+        "scatter_hadir": fig_scatter2,
+    }
+    return dashboard
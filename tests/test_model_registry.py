@@ -0,0 +1,129 @@
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from model_registry import FEATURES, ModelRegistry, categorize, load_manifest
+from prediction_service import get_category_and_message
+
+KATEGORI_LABELS = {
+    "❌ PERLU PERHATIAN": "Perlu Perhatian",
+    "⚠️ MEMUASKAN": "Memuaskan",
+    "✅ SANGAT MEMUASKAN": "Sangat Memuaskan",
+    "🏆 CUM LAUDE": "Cum Laude",
+}
+
+
+def features(n=20):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "rata2_nilai": rng.uniform(60, 95, n),
+        "rata2_hadir": rng.uniform(8, 14, n),
+        "jumlah_mk_diambil": rng.integers(30, 60, n).astype(float),
+    })
+
+
+def save_model(path, columns=FEATURES, offset=0.0):
+    """Regresi linear kecil; IPK = rata2_nilai / 25 + offset."""
+    X = features()[columns]
+    model = LinearRegression().fit(X, X["rata2_nilai"] / 25 + offset)
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+    return str(path)
+
+
+def write_manifest(tmp_path, entries):
+    path = tmp_path / "model_registry.json"
+    path.write_text(json.dumps({"models": entries}), encoding="utf-8")
+    return str(path)
+
+
+def entry(name, path, production=False):
+    return {"name": name, "version": "1.0", "path": path, "production": production,
+            "metrics": {"R²": 0.9, "RMSE": 0.1, "MAE": 0.08}}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry([
+        entry("prod", save_model(tmp_path / "prod.pkl"), production=True),
+        entry("kandidat", save_model(tmp_path / "kandidat.pkl", offset=0.1)),
+    ])
+
+
+def test_categorize_matches_get_category_and_message():
+    values = [0.0, 2.75, 2.76, 3.0, 3.01, 3.5, 3.51, 4.0]
+    expected = [KATEGORI_LABELS[get_category_and_message(v)["kategori"]] for v in values]
+    assert categorize(pd.Series(values)).astype(str).tolist() == expected
+
+
+def test_load_manifest_rejects_empty(tmp_path):
+    with pytest.raises(ValueError):
+        load_manifest(write_manifest(tmp_path, []))
+
+
+def test_load_manifest_rejects_multiple_production(tmp_path):
+    path = write_manifest(tmp_path, [entry("a", "a.pkl", True), entry("b", "b.pkl", True)])
+    with pytest.raises(ValueError):
+        load_manifest(path)
+
+
+def test_score_all_selected_keys(registry):
+    X = features()
+    scored = registry.score_all(X, ["kandidat@1.0"])
+    assert scored.columns.tolist() == ["kandidat@1.0"]
+    assert scored.index.equals(X.index)
+    np.testing.assert_allclose(scored["kandidat@1.0"], X["rata2_nilai"] / 25 + 0.1)
+
+
+def test_compare_against_production(registry):
+    predictions = registry.score_all(features())
+    deltas, summary = registry.compare(predictions)
+
+    assert deltas.columns.tolist() == ["Δ kandidat@1.0"]
+    np.testing.assert_allclose(deltas["Δ kandidat@1.0"], 0.1)
+    row = summary.iloc[0]
+    assert row["Model"] == "kandidat@1.0"
+    assert row["Baseline"] == "prod@1.0"
+    assert row["MAE vs Baseline"] == pytest.approx(0.1)
+    assert row["Max |Δ|"] == pytest.approx(0.1)
+    changed = (categorize(predictions["kandidat@1.0"]) != categorize(predictions["prod@1.0"])).sum()
+    assert row["Beda Kategori"] == changed
+
+
+def test_load_errors_are_recorded_per_model(tmp_path):
+    missing_module = tmp_path / "missing_module.pkl"
+    missing_module.write_bytes(b"cmodul_yang_tidak_ada\nModel\n.")
+    registry = ModelRegistry.from_manifest(write_manifest(tmp_path, [
+        entry("prod", save_model(tmp_path / "prod.pkl"), production=True),
+        entry("modul", str(missing_module)),
+        entry("hilang", str(tmp_path / "tidak_ada.pkl")),
+    ]))
+
+    assert list(registry.models) == ["prod@1.0"]
+    assert registry.production_model is not None
+    assert "ModuleNotFoundError" in registry.errors["modul@1.0"]
+    assert "FileNotFoundError" in registry.errors["hilang@1.0"]
+
+
+def test_failing_candidate_is_dropped_when_scoring(tmp_path):
+    registry = ModelRegistry([
+        entry("prod", save_model(tmp_path / "prod.pkl"), production=True),
+        entry("dua_fitur", save_model(tmp_path / "dua.pkl", columns=FEATURES[:2])),
+    ])
+    scored = registry.score_all(features())
+
+    assert scored.columns.tolist() == ["prod@1.0"]
+    assert list(registry.models) == ["prod@1.0"]
+    assert "Gagal memprediksi" in registry.errors["dua_fitur@1.0"]
+
+
+def test_failing_production_raises(tmp_path):
+    registry = ModelRegistry([
+        entry("prod", save_model(tmp_path / "prod.pkl", columns=FEATURES[:2]), production=True),
+    ])
+    with pytest.raises(ValueError):
+        registry.score_all(features())
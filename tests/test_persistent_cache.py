@@ -0,0 +1,170 @@
+import itertools
+import pickle
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+import persistent_cache
+import prediction_service as service
+from model_registry import FEATURES, ModelRegistry
+from persistent_cache import ARRAY, CACHE_VERSION, FRAME, JSON, PersistentCache, cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PersistentCache(str(tmp_path / "cache.sqlite3"))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """last_access yang selalu naik, agar urutan LRU tidak bergantung resolusi jam."""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(persistent_cache.time, "time", lambda: float(next(ticks)))
+
+
+def corrupt(cache, key, blob):
+    with sqlite3.connect(cache.path) as conn:
+        conn.execute("UPDATE entries SET value = ? WHERE key = ?", (blob, key))
+
+
+def test_cache_key_includes_version_and_libraries():
+    key = cache_key("predictions", "data", "model")
+    assert key.startswith(f"predictions:v{CACHE_VERSION}:")
+    assert key.endswith(":data:model")
+    assert key == cache_key("predictions", "data", "model")
+
+
+def test_codecs_roundtrip(cache):
+    df = pd.DataFrame({"NIM": [10, 12], "rata2_nilai": [78.0, 85.5]})
+    cache.set("frame", df, FRAME)
+    cache.set("array", np.array([3.1, 3.5]), ARRAY)
+    cache.set("json", {"10": 0, "12": 1}, JSON)
+
+    pd.testing.assert_frame_equal(cache.get("frame", FRAME), df)
+    np.testing.assert_array_equal(cache.get("array", ARRAY), [3.1, 3.5])
+    assert cache.get("json", JSON) == {"10": 0, "12": 1}
+
+
+def test_lru_eviction_under_max_bytes(tmp_path, clock):
+    # Setiap entri 100 float64 = 800 byte; batas muat tiga entri
+    cache = PersistentCache(str(tmp_path / "cache.sqlite3"), max_bytes=2500)
+    for key in "abc":
+        cache.set(key, np.zeros(100), ARRAY)
+    cache.get("a", ARRAY)  # a jadi yang paling baru diakses
+    cache.set("d", np.zeros(100), ARRAY)
+
+    assert cache.get("b", ARRAY) is None
+    for key in "acd":
+        assert cache.get(key, ARRAY) is not None
+    assert cache.stats()["bytes"] <= 2500
+
+
+def test_oversized_value_is_skipped(tmp_path):
+    cache = PersistentCache(str(tmp_path / "cache.sqlite3"), max_bytes=100)
+    cache.set("besar", np.zeros(100), ARRAY)
+
+    assert cache.get("besar", ARRAY) is None
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("value, codec, blob", [
+    (pd.DataFrame({"a": [1]}), FRAME, b"bukan parquet"),
+    (pd.DataFrame({"a": [1]}), FRAME, pickle.dumps(pd.DataFrame({"a": [1]}))),
+    (np.ones(3), ARRAY, b"\x00" * 7),
+    ({"x": 1}, JSON, b"{rusak"),
+])
+def test_corrupted_entry_is_deleted_and_recomputed(cache, value, codec, blob):
+    cache.set("k", value, codec)
+    corrupt(cache, "k", blob)
+
+    assert cache.get("k", codec) is None
+    assert cache.stats()["entries"] == 0
+    assert cache.get_or_compute("k", lambda: value, codec) is not None
+    assert cache.stats()["entries"] == 1
+
+
+# === load_predictions ===
+def dataset(n=30):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        "NIM": np.arange(n) + 100,
+        "rata2_nilai": rng.uniform(60, 95, n),
+        "rata2_hadir": rng.uniform(8, 14, n),
+        "jumlah_mk_diambil": rng.integers(30, 60, n),
+    })
+
+
+def save_model(path, offset=0.0):
+    X = dataset()[FEATURES]
+    model = LinearRegression().fit(X, X["rata2_nilai"] / 25 + offset)
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+    return str(path)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    data_path = tmp_path / "data.csv"
+    dataset().to_csv(data_path, index=False)
+    entries = [
+        {"name": "prod", "version": "1.0", "path": save_model(tmp_path / "prod.pkl"), "production": True},
+        {"name": "kandidat", "version": "1.0", "path": save_model(tmp_path / "kandidat.pkl", 0.1)},
+    ]
+    return str(data_path), entries
+
+
+def load(cache, entries, data_path, calls):
+    registry = ModelRegistry(entries)
+    score_all = registry.score_all
+
+    def spy(features, keys=None):
+        calls.append(list(keys))
+        return score_all(features, keys)
+
+    registry.score_all = spy
+    df = service.load_dataset(cache, data_path)
+    cols = service.detect_column_names(df)
+    return service.load_predictions(cache, registry, df, cols, data_path)
+
+
+def test_load_predictions_scores_only_cache_misses(cache, workspace):
+    data_path, entries = workspace
+    calls = []
+
+    cold = load(cache, entries, data_path, calls)
+    assert calls == [["prod@1.0", "kandidat@1.0"]]
+
+    warm = load(cache, entries, data_path, calls)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(cold, warm)
+
+    entries[1]["path"] = save_model(entries[1]["path"], 0.2)  # file model berubah -> key baru
+    changed = load(cache, entries, data_path, calls)
+    assert calls[-1] == ["kandidat@1.0"]
+    np.testing.assert_allclose(changed["kandidat@1.0"] - changed["prod@1.0"], 0.2)
+
+
+def test_load_predictions_rescores_truncated_entry(cache, workspace):
+    data_path, entries = workspace
+    calls = []
+    expected = load(cache, entries, data_path, calls)
+
+    df = service.load_dataset(cache, data_path)
+    key = service.predictions_cache_key(data_path, entries[0]["path"], service.detect_column_names(df))
+    corrupt(cache, key, np.zeros(5).tobytes())
+
+    result = load(cache, entries, data_path, calls)
+    assert calls[-1] == ["prod@1.0"]
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_predictions_key_changes_with_column_mapping(workspace):
+    data_path, entries = workspace
+    cols = {"rata2_nilai": "rata2_nilai", "rata2_hadir": "rata2_hadir", "jumlah_mk_diambil": "jumlah_mk_diambil"}
+    remapped = dict(cols, rata2_nilai="avg_grade")
+
+    assert (service.predictions_cache_key(data_path, entries[0]["path"], cols)
+            != service.predictions_cache_key(data_path, entries[0]["path"], remapped))